@@ -0,0 +1,291 @@
+"""
+This Python File benchmarks Fast Nash and the game tree code.  Each benchmark is timed over a
+grid of n (with Tmax fixed) and a grid of Tmax (with n fixed), and the peak memory of a single
+call is recorded with tracemalloc.  An empirical scaling exponent is fitted to each grid, so the
+O(n*Tmax) claim in fastnash.py can be checked against the exponent of about 1 it predicts for
+both n and Tmax.  The game tree grows as O(Tmax^n), so its exponents grow with the grid.
+
+Results are stored as JSON.  Running with --baseline compares against an earlier run and exits
+with status 1 when any point is slower than the baseline by more than --factor and by more than
+--min-seconds.  Running with --max-exponent exits with status 1 when a Fast Nash benchmark's
+fitted exponent in n or Tmax is above it.
+
+usage: python benchmark.py [--quick] [--save results.json] [--baseline results.json]
+                           [--factor 2.0] [--min-seconds 0.001] [--max-exponent 1.3]
+"""
+
+
+import argparse
+import atexit
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy
+import fastnash
+import tree
+
+
+"""
+make_params(n, Tmax)
+
+:parameter n: the number of players.
+           Tmax: the length of the game
+
+Builds the parameter dictionary used by every benchmark.  Rmax is set the same way as in
+tree.solve(), so that resources run out near the end of the game for any n and Tmax.
+
+:return d: the dictionary of parameters used in the game.
+"""
+def make_params(n, Tmax):
+    d = {"N": 2,
+         "n": n,
+         "r": 12/5,
+         "c": 2,
+         "Rmin": 40,
+         "Tmax": Tmax,
+         "b": 0.8,
+         "k": 0.5,
+         "f": 4}
+    d["Rmax"] = d["Rmin"] + (Tmax + 1) * d["r"] / n
+    return d
+
+
+"""
+setup_*(n, Tmax)
+
+Each setup function does any work the benchmark depends on but should not time, then returns a
+function of no arguments that runs the code being timed.
+"""
+def setup_a_finder(n, Tmax):
+    d = make_params(n, Tmax)
+    return lambda: fastnash.a_finder(d)
+
+def setup_departure_vector(n, Tmax):
+    d = make_params(n, Tmax)
+    a = fastnash.a_finder(d)
+    return lambda: fastnash.get_departure_vector(d, a)
+
+def setup_payoffs(n, Tmax):
+    d = make_params(n, Tmax)
+    a = fastnash.a_finder(d)
+    dep = fastnash.get_departure_vector(d, a)
+    return lambda: fastnash.get_payoffs(d, dep, a)
+
+def setup_sensitivity_analysis(n, Tmax):
+    d = make_params(n, Tmax)
+    # a file of our own, so that benchmarks run at the same time do not write over each other
+    handle, outfile = tempfile.mkstemp(suffix=".csv")
+    os.close(handle)
+    atexit.register(os.remove, outfile)
+    return lambda: fastnash.sensitivity_analysis(d, "k", 0.5, 1.5, outfile, 0.25)
+
+def setup_tree(n, Tmax):
+    d = make_params(n, Tmax)
+
+    def run():
+        t = tree.solve(d)
+        tree.solveNE(t, t["root"])
+    return run
+
+
+# name: (setup function, n grid at fixed Tmax, Tmax grid at fixed n)
+BENCHMARKS = {
+    "a_finder": (setup_a_finder,
+                 ([25, 50, 100, 200, 400], 100), (50, [25, 50, 100, 200, 400])),
+    "get_departure_vector": (setup_departure_vector,
+                             ([25, 50, 100, 200, 400], 100), (50, [25, 50, 100, 200, 400])),
+    "get_payoffs": (setup_payoffs,
+                    ([25, 50, 100, 200, 400], 100), (50, [25, 50, 100, 200, 400])),
+    "sensitivity_analysis": (setup_sensitivity_analysis,
+                             ([10, 20, 40, 80], 50), (20, [25, 50, 100, 200])),
+    "tree": (setup_tree, ([2, 3, 4], 2), (2, [1, 2, 3, 4])),
+}
+
+# benchmarks of Fast Nash itself, which should scale linearly in both n and Tmax
+FAST_NASH = ["a_finder", "get_departure_vector", "get_payoffs", "sensitivity_analysis"]
+
+# grids used with --quick
+QUICK = {
+    "a_finder": (([10, 20, 40], 20), (10, [10, 20, 40])),
+    "get_departure_vector": (([10, 20, 40], 20), (10, [10, 20, 40])),
+    "get_payoffs": (([10, 20, 40], 20), (10, [10, 20, 40])),
+    "sensitivity_analysis": (([5, 10, 20], 10), (5, [10, 20, 40])),
+    "tree": (([2, 3], 1), (2, [1, 2])),
+}
+
+
+"""
+time_call(func, repeat)
+
+:parameter func: a function of no arguments
+           repeat: the number of timed runs
+
+Times func.  The fastest run is used since it is the least disturbed by the rest of the machine.
+Peak memory is measured in a separate run because tracemalloc slows down the code it traces.
+
+:return seconds: the fastest of the timed runs.
+        peak: the peak number of bytes allocated during one run.
+"""
+def time_call(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+"""
+fit_exponent(sizes, seconds)
+
+Fits seconds = C * size^e by least squares on a log-log scale.
+
+:return e: the empirical scaling exponent.
+"""
+def fit_exponent(sizes, seconds):
+    return float(numpy.polyfit(numpy.log(sizes), numpy.log(seconds), 1)[0])
+
+
+"""
+run_benchmarks(quick=False, repeat=5, names=None)
+
+:parameter quick: use the small grids in QUICK
+           repeat: the number of timed runs at every grid point
+           names: the benchmarks to run, defaulting to all of them
+
+Runs the benchmarks.  The result for each benchmark holds one entry per grid, each with the
+measured points and the fitted exponent.
+
+:return results: a dictionary that can be written out as JSON.
+"""
+def run_benchmarks(quick=False, repeat=5, names=None):
+    results = {}
+    for name in names or BENCHMARKS:
+        setup = BENCHMARKS[name][0]
+        n_grid, Tmax_grid = QUICK[name] if quick else BENCHMARKS[name][1:]
+        results[name] = {}
+        for axis, grid in (("n", n_grid), ("Tmax", Tmax_grid)):
+            if axis == "n":
+                points = [(n, grid[1]) for n in grid[0]]
+            else:
+                points = [(grid[0], Tmax) for Tmax in grid[1]]
+
+            measured = []
+            for n, Tmax in points:
+                seconds, peak = time_call(setup(n, Tmax), repeat)
+                measured.append({"n": n, "Tmax": Tmax, "seconds": seconds, "peak_bytes": peak})
+
+            sizes = [point[axis] for point in measured]
+            results[name][axis] = {
+                "points": measured,
+                "exponent": fit_exponent(sizes, [point["seconds"] for point in measured])}
+    return results
+
+
+"""
+compare(results, baseline, factor, min_seconds=0.001)
+
+:parameter results: the output of run_benchmarks()
+           baseline: an earlier output of run_benchmarks(), e.g. loaded from JSON
+           factor: how many times slower than the baseline a point may be
+           min_seconds: how many seconds slower than the baseline a point may be in any case.
+           Timings of very fast points vary by more than factor from run to run, so a point
+           only counts as a regression when it is slower by both measures.
+
+Points missing from the baseline are skipped.
+
+:return regressions: a message for each point that is more than factor times slower.
+"""
+def compare(results, baseline, factor, min_seconds=0.001):
+    regressions = []
+    for name, axes in results.items():
+        for axis, result in axes.items():
+            old = baseline.get(name, {}).get(axis, {}).get("points", [])
+            old = {(point["n"], point["Tmax"]): point["seconds"] for point in old}
+            for point in result["points"]:
+                key = (point["n"], point["Tmax"])
+                if key in old and point["seconds"] > factor * old[key] and \
+                        point["seconds"] - old[key] > min_seconds:
+                    regressions.append(name + " n=" + str(key[0]) + " Tmax=" + str(key[1]) +
+                                       ": " + "%.3g" % point["seconds"] + "s, baseline " +
+                                       "%.3g" % old[key] + "s")
+    return regressions
+
+
+"""
+check_exponents(results, max_exponent)
+
+:parameter results: the output of run_benchmarks()
+           max_exponent: the largest exponent allowed in n or Tmax
+
+Checks the O(n*Tmax) claim: each Fast Nash benchmark should have exponents of about 1.  The game
+tree benchmark is not checked.
+
+:return failures: a message for each exponent above max_exponent.
+"""
+def check_exponents(results, max_exponent):
+    failures = []
+    for name in FAST_NASH:
+        for axis, result in results.get(name, {}).items():
+            if result["exponent"] > max_exponent:
+                failures.append(name + ": exponent in " + axis + " = " +
+                                "%.2f" % result["exponent"])
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Fast Nash and the game tree code.")
+    parser.add_argument("--quick", action="store_true", help="use small grids")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per grid point")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS),
+                        help="run only these benchmarks")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against this JSON file")
+    parser.add_argument("--factor", type=float, default=2.0,
+                        help="allowed slowdown relative to the baseline")
+    parser.add_argument("--min-seconds", type=float, default=0.001,
+                        help="slowdowns smaller than this many seconds are never regressions")
+    parser.add_argument("--max-exponent", type=float,
+                        help="fail if a Fast Nash exponent in n or Tmax is above this")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.quick, args.repeat, args.only)
+    for name, axes in results.items():
+        for axis, result in axes.items():
+            peak = max(point["peak_bytes"] for point in result["points"])
+            print(name + ": exponent in " + axis + " = " + "%.2f" % result["exponent"] +
+                  ", peak memory " + str(peak) + " bytes")
+
+    if args.save:
+        with open(args.save, 'w') as file:
+            json.dump(results, file, indent=2)
+
+    failed = False
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file), args.factor, args.min_seconds)
+        for message in regressions:
+            print("SLOWER THAN BASELINE: " + message)
+        failed = failed or bool(regressions)
+
+    if args.max_exponent is not None:
+        failures = check_exponents(results, args.max_exponent)
+        for message in failures:
+            print("SCALES WORSE THAN EXPECTED: " + message)
+        failed = failed or bool(failures)
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,195 @@
+"""
+This Python File runs multi-generation simulations of dispersal timing on top of Fast Nash.  Many
+independent lineages are advanced in lockstep: every generation, each lineage plays one game with
+its own parameter values, all of those games are solved as a single batch with batch_a_finder(),
+and the lineage's parameters are then updated for the next generation.
+
+Population state is held in preallocated NumPy arrays, one row per lineage, and trajectories are
+buffered and appended to a binary file every few generations, so memory use does not grow with
+the number of generations.  A finished trajectory file can be read back with
+numpy.fromfile(outfile, dtype=trajectory_dtype(d, keys)).
+"""
+
+
+import os
+import tempfile
+import numpy
+from fastnash import batch_a_finder, batch_departure_vector, batch_payoffs
+
+
+"""
+trajectory_dtype(d, keys)
+
+:parameter d: the dictionary of parameters used in the game.
+           keys: the names of the parameters that change between generations
+
+Each record of a trajectory file holds one lineage in one generation: the parameter values it
+played with, every player's departure date and every player's payoff.
+
+:return dtype: the NumPy record type of a trajectory file.
+"""
+def trajectory_dtype(d, keys):
+    return numpy.dtype([("generation", numpy.int64),
+                        ("lineage", numpy.int64),
+                        ("params", numpy.float64, (len(keys),)),
+                        ("departure", numpy.int64, (d["n"],)),
+                        ("payoff", numpy.float64, (d["n"],))])
+
+
+"""
+random_drift(generation, params, departure, payoff, vary, rng)
+
+:parameter generation: the generation that has just been solved
+           params: a dictionary of per-lineage parameter arrays, updated in place
+           departure: a (lineages x n) array of the generation's departure dates
+           payoff: a (lineages x n) array of the generation's payoffs
+           vary: a dictionary mapping a parameter name to (step, low, high)
+           rng: a numpy.random.Generator
+
+The default population model.  Every varying parameter takes an independent Gaussian step of
+standard deviation "step" in every lineage and is then clipped to [low, high].  Parameters that
+must stay whole numbers, such as N, are rounded.
+"""
+def random_drift(generation, params, departure, payoff, vary, rng):
+    for key, (step, low, high) in vary.items():
+        values = params[key]
+        values += rng.normal(0, step, values.shape)
+        if key == "N":
+            numpy.round(values, out=values)
+        numpy.clip(values, low, high, out=values)
+
+
+"""
+simulate(d, lineages, generations, outfile, vary, update=random_drift, flush_every=1000,
+         buffer_bytes=None, seed=None)
+
+:parameter d: the dictionary of parameters used in the game; the starting point of every lineage.
+           lineages: the number of independent lineages
+           generations: the number of generations to run
+           outfile: the binary file trajectories are written to
+           vary: a dictionary mapping a parameter name to (step, low, high); see random_drift()
+           update: called as update(generation, params, departure, payoff, vary, rng) after each
+           generation to move the parameters on to the next one
+           flush_every: the largest number of generations buffered before writing to outfile
+           buffer_bytes: if given, the write buffer holds as many generations as fit in this many
+           bytes (at least one), in place of flush_every
+           seed: the seed for the random number generator
+
+Runs the simulation.  "n" and "Tmax" fix the shape of the game and cannot vary.  The write buffer
+holds at most flush_every (and never more than generations) generations of lineages records, so
+memory use is set by the buffer size, not by the number of generations.
+
+:return params: the per-lineage parameter arrays after the last generation.
+"""
+def simulate(d, lineages, generations, outfile, vary, update=random_drift, flush_every=1000,
+             buffer_bytes=None, seed=None):
+    # check before outfile is opened, so a bad call does not truncate an existing trajectory
+    for key in ("n", "Tmax"):
+        if key in vary:
+            raise ValueError("'" + key + "' fixes the shape of the game and cannot vary")
+
+    keys = list(vary)
+    rng = numpy.random.default_rng(seed)
+    params = {key: numpy.full(lineages, d[key], dtype=float) for key in keys}
+
+    dtype = trajectory_dtype(d, keys)
+    if buffer_bytes is not None:
+        flush_every = max(1, buffer_bytes // (dtype.itemsize * lineages))
+    flush_every = max(1, min(flush_every, generations))
+    buffer = numpy.zeros((flush_every, lineages), dtype=dtype)
+    buffer["lineage"] = numpy.arange(lineages)
+    filled = 0
+
+    with open(outfile, 'wb') as file:
+        for generation in range(generations):
+            a = batch_a_finder(d, params, lineages)
+            departure = batch_departure_vector(d, a)
+            payoff = batch_payoffs(d, params, departure, a)
+
+            # record the generation before the parameters move on
+            record = buffer[filled]
+            record["generation"] = generation
+            for i, key in enumerate(keys):
+                record["params"][:, i] = params[key]
+            record["departure"] = departure
+            record["payoff"] = payoff
+            filled += 1
+            if filled == flush_every:
+                buffer.tofile(file)
+                filled = 0
+
+            update(generation, params, departure, payoff, vary, rng)
+
+        buffer[:filled].tofile(file)
+    return params
+
+
+"""
+test_cases()
+
+Runs a short simulation whose buffer is flushed several times and checks the trajectory file 
+read back from disk.
+"""
+def test_cases():
+    print("Trajectory file")
+    d = {"N": 2,
+         "n": 4,
+         "r": 12/5,
+         "c": 2,
+         "Rmin": 40,
+         "Rmax": 60,
+         "Tmax": 20,
+         "b": 0.8,
+         "k": 0.5,
+         "f": 4}
+    lineages, generations = 5, 23
+    handle, outfile = tempfile.mkstemp(suffix=".bin")
+    os.close(handle)
+    try:
+        simulate(d, lineages, generations, outfile, {"k": (0.1, 0.1, 5)}, flush_every=10,
+                 seed=0)
+        records = numpy.fromfile(outfile, dtype=trajectory_dtype(d, ["k"]))
+    finally:
+        os.remove(outfile)
+
+    if len(records) == lineages * generations:
+        print("PASS: Record count")
+    else:
+        print("FAIL: Record count: expected " + str(lineages * generations) + ", got " +
+              str(len(records)))
+    expected = numpy.repeat(numpy.arange(generations), lineages)
+    if (records["generation"] == expected).all():
+        print("PASS: Generations")
+    else:
+        print("FAIL: Generations: got " + str(records["generation"].tolist()))
+    expected = numpy.tile(numpy.arange(lineages), generations)
+    if (records["lineage"] == expected).all():
+        print("PASS: Lineages")
+    else:
+        print("FAIL: Lineages: got " + str(records["lineage"].tolist()))
+    if (records["params"][:lineages, 0] == d["k"]).all():
+        print("PASS: First generation parameters")
+    else:
+        print("FAIL: First generation parameters: got " + str(records["params"][:lineages]))
+
+
+def main():
+    """
+    declare dictionary here:
+     example = {"N": 2,
+             "n": 4,
+             "r": 12/5,
+             "c": 2,
+             "Rmin": 40,
+             "Rmax": 136,
+             "Tmax": 120,
+             "b": 0.8,
+             "k": 0.5,
+             "f": 4}
+     call functions here:
+     simulate(example, 1000, 10000, "trajectory.bin",
+              {"k": (0.05, 0.1, 5), "c": (0.1, 0.5, 10)}, seed=0)
+    """
+
+if __name__ == '__main__':
+    main()
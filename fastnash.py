@@ -263,11 +263,14 @@ payoff and thus gives the Nash Equilibrium payoffs for the whole game.
 def get_payoffs(d, departure_vector, a_vector):
     resource = calc_resource_vector(d, a_vector)
     payoff = [0]*d["n"]
+    r = None
     for player, time in enumerate(departure_vector):
         if time != d["Tmax"]:
             payoff[player] = calc_payoff(d, time, resource[time])
         else:
-            r = get_Rmax_index(d, resource)
+            # every non-disperser reaches Rmax on the same day
+            if r is None:
+                r = get_Rmax_index(d, resource)
             payoff[player] = calc_nodisperse_payoff(d,r)
     return payoff
 
@@ -275,6 +278,326 @@ def calc_nodisperse_payoff(d, day):
     return (((d["Tmax"] - day ) / d["Tmax"]) * (d["f"]) + (d["N"] - 1) * (d["f"]))
 
 
+"""
+get_departure_runs(d, a_vector)
+
+:parameter d: the dictionary of parameters used in the game.
+           a_vector: the fully updated remaining number of philopatric individuals at any date
+
+A run-length form of get_departure_vector().  Players in equilibrium share only a few distinct 
+departure dates, so rather than one entry per player we give each distinct date once together 
+with the number of players leaving on it.  Dates are in the same (decreasing) order as in 
+get_departure_vector(), so numpy.repeat(dates, counts) gives the departure vector back.  This 
+takes O(Tmax) time however large n is.
+
+:returns dates: the distinct departure dates, latest first.
+         counts: the number of players departing on each date.
+"""
+def get_departure_runs(d, a_vector):
+    time = d["Tmax"]
+    remaining = numpy.asarray(a_vector)
+
+    # a_vector[t-1] - a_vector[t] players leave on day t; those left on the last day never do
+    leaving = numpy.empty(time + 1, dtype=numpy.int64)
+    leaving[0] = d["n"] - remaining[0]
+    leaving[1:time] = remaining[:-1] - remaining[1:]
+    leaving[time] = remaining[-1]
+
+    dates = numpy.flatnonzero(leaving)[::-1]
+    return dates, leaving[dates]
+
+
+"""
+get_grouped_payoffs(d, dates, a_vector)
+
+:parameter d: the dictionary of parameters used in the game.
+           dates: distinct departure dates, e.g. from get_departure_runs()
+           a_vector: the fully updated remaining number of philopatric individuals at any date
+
+Computes the payoff once for each distinct departure date.  A date of "Tmax" means no 
+dispersal.
+
+:returns payoff: an array with the payoff of departing on each date.
+"""
+def get_grouped_payoffs(d, dates, a_vector):
+    resource = calc_resource_vector(d, a_vector)
+    payoff = numpy.empty(len(dates))
+    for i, time in enumerate(dates):
+        if time != d["Tmax"]:
+            payoff[i] = calc_payoff(d, time, resource[time])
+        else:
+            payoff[i] = calc_nodisperse_payoff(d, get_Rmax_index(d, resource))
+    return payoff
+
+
+"""
+get_payoffs_by_date(d, departure_vector, a_vector)
+
+:parameter d: the dictionary of parameters used in the game.
+           departure_vector: a vector of each player's departure date.
+           a_vector: the fully updated remaining number of philopatric individuals at any date
+
+Gives the same values as get_payoffs(), but the payoff is computed once per distinct departure 
+date and then spread to the players sharing it.
+
+:returns payoff: an array of each player's payoff
+"""
+def get_payoffs_by_date(d, departure_vector, a_vector):
+    dates, players = numpy.unique(departure_vector, return_inverse=True)
+    return get_grouped_payoffs(d, dates, a_vector)[players]
+
+
+## THE FOLLOWING FUNCTIONS WARM-START A_FINDER FROM A NEARBY SOLUTION
+"""
+a_finder_warm(d, hint=None, width=1)
+
+:parameter d: the dictionary of parameters used in the game.
+           hint: the dispersal dates chosen for each player in a nearby game, in the order
+           a_finder_warm() returns them.  Players without a hint are solved from scratch.
+           width: how many days either side of a hinted date are evaluated
+
+a_finder() for a game that is close to one already solved, such as the next point of a fine
+sweep.  Each player's payoff is evaluated only around its hinted date (see
+find_dispersal_date_near()), falling back to all dates when the hint cannot be confirmed, so
+the result is identical to a_finder().
+
+:returns a_vector: as returned by a_finder().
+         dates: the dispersal date chosen for each player, to be passed as the next hint.
+"""
+def a_finder_warm(d, hint=None, width=1):
+    a_vector = [d["n"] for _ in range(d["Tmax"])]
+    dates = [0] * d["n"]
+
+    for i in range(d["n"]):
+        resource = calc_resource_vector(d, a_vector)
+        if hint is not None and i < len(hint):
+            date = find_dispersal_date_near(d, resource, hint[i], width)
+        else:
+            date = find_dispersal_date(d, resource)
+        dates[i] = date
+        for j in range(date, d["Tmax"]):
+            a_vector[j] -= 1
+    return a_vector, dates
+
+
+"""
+find_dispersal_date_near(d, resource, hint, width)
+
+:parameter d: the dictionary of parameters used in the game.
+           resource: the accumulated resources of an individual at any point in time
+           hint: the dispersal date expected to be optimal
+           width: how many days either side of hint are evaluated
+
+Finds the same date as find_dispersal_date() while evaluating the payoff on as few days as 
+possible.  Days within width of hint are evaluated first, along with not dispersing.  Resources 
+never decrease over time, so survival never decreases and q never increases.  The payoff of any 
+day in a block of days [u, v] is then at most the payoff formula with the survival and q of day 
+v and the time left after day u.  The remaining days are split into blocks of about 
+sqrt(Tmax) days, and only blocks whose bound reaches the best payoff found so far are 
+evaluated, most promising first.  Every day left out has a payoff strictly below the best, so 
+the earliest best day is the one find_dispersal_date() picks.  When the best payoff is not 
+unique, or when the parameters do not give these monotonicity properties, all days are 
+evaluated with find_dispersal_date() instead.
+
+:return departure date: the date an individual begins dispersal.
+"""
+def find_dispersal_date_near(d, resource, hint, width):
+    time = d["Tmax"]
+    gain = d["f"] + d["b"]
+    if d["r"] < 0 or d["k"] <= 0 or d["Rmin"] <= 0 or d["c"] <= 0 or gain < 0:
+        return find_dispersal_date(d, resource)
+
+    hi = min(time - 1, hint + width)
+    lo = min(max(0, hint - width), hi + 1)
+    payoffs = {i: calc_payoff(d, i, resource[i]) for i in range(lo, hi + 1)}
+    j = get_Rmax_index(d, resource)
+    payoffs[time] = ((d["Tmax"] - j) / d["Tmax"]) * (d["f"]) + (d["f"]) * (d["N"] - 1)
+    best = max(payoffs.values())
+
+    # bound the payoff of each block of days outside the window
+    size = max(1, math.isqrt(time))
+    blocks = []
+    for first, last in ((0, lo - 1), (hi + 1, time - 1)):
+        for u in range(first, last + 1, size):
+            v = min(u + size - 1, last)
+            x = ((time - u - calc_q(d, resource[v])) / time) * gain + (d["N"] - 1) * gain
+            blocks.append((calc_survival(d, resource[v]) * x if x > 0 else 0, u, v))
+
+    # the margin keeps rounding in the bounds from letting a skipped day tie or win
+    for bound, u, v in sorted(blocks, reverse=True):
+        if best > bound + 1e-9 * abs(bound):
+            break
+        for i in range(u, v + 1):
+            payoffs[i] = calc_payoff(d, i, resource[i])
+        best = max(payoffs.values())
+
+    if list(payoffs.values()).count(best) > 1:
+        return find_dispersal_date(d, resource)
+    return min(i for i, p in payoffs.items() if p == best)
+
+
+## THE FOLLOWING FUNCTIONS SOLVE MANY GAMES AT ONCE
+"""
+batch_params(d, params, lineages)
+
+:parameter d: the dictionary of parameters used in the game.
+           params: a dictionary mapping parameter names to arrays with one value per game.  Any
+           parameter not in params is taken from d.
+           lineages: the number of games solved together
+
+Builds a dictionary of column arrays (shape lineages x 1) so that every parameter broadcasts
+against the (lineages x Tmax) arrays used by the batched functions.  "n" and "Tmax" set the
+shape of the game, so they must be shared by every game in a batch.
+
+:return p: the dictionary of per-game parameter columns.
+"""
+def batch_params(d, params, lineages):
+    for key in ("n", "Tmax"):
+        if key in params:
+            raise ValueError("'" + key + "' must be the same for every game in a batch")
+    p = {}
+    for key in ("N", "r", "c", "Rmin", "Rmax", "b", "k", "f"):
+        value = numpy.asarray(params.get(key, d[key]), dtype=float)
+        p[key] = numpy.broadcast_to(value, (lineages,)).reshape(lineages, 1)
+    p["n"] = d["n"]
+    p["Tmax"] = d["Tmax"]
+    return p
+
+
+"""
+batch_resource_vector(p, a_vector)
+
+:parameter p: the per-game parameter columns from batch_params().
+           a_vector: a (games x Tmax) array of remaining philopatric individuals at any time
+
+The batched version of calc_resource_vector().  Row g is calc_resource_vector() for game g.
+
+:return resource: a (games x Tmax) array of accumulated resources at any date of departure.
+"""
+def batch_resource_vector(p, a_vector):
+    resource = numpy.zeros(a_vector.shape)
+    share = numpy.divide(p["r"], a_vector, out=numpy.zeros(a_vector.shape),
+                         where=a_vector != 0)
+
+    # resources are split by the number of remaining philopatric individuals
+    for i in range(1, p["Tmax"]):
+        resource[:, i] = numpy.where(a_vector[:, i-1] != 0,
+                                     resource[:, i-1] + share[:, i-1], 0)
+
+    resource += p["Rmin"]
+    return resource
+
+
+"""
+batch_q(p, r), batch_survival(p, r), batch_payoff(p, day, r)
+
+:parameter p: the per-game parameter columns from batch_params().
+           day: the day dispersal occurs on, broadcastable against r
+           r: an array of accumulated resources, one row per game
+
+Element-wise versions of calc_q(), calc_survival() and calc_payoff().
+
+:return: an array the shape of r.
+"""
+def batch_q(p, r):
+    return numpy.ceil(numpy.maximum(0, (p["Rmax"] - r) / p["c"]))
+
+def batch_survival(p, r):
+    return numpy.power(r / (r + p["k"]), batch_q(p, r))
+
+def batch_payoff(p, day, r):
+    return batch_survival(p, r) * \
+        (((p["Tmax"] - day - batch_q(p, r)) / p["Tmax"]) * (p["f"] + p["b"]) + (
+                                                        p["N"] - 1) * (p["f"] + p["b"]))
+
+
+"""
+batch_Rmax_index(p, resource)
+
+:parameter p: the per-game parameter columns from batch_params().
+           resource: a (games x Tmax) array of accumulated resources
+
+The batched version of get_Rmax_index().
+
+:return index: the day at which each game's non-dispersers reach Rmax.
+"""
+def batch_Rmax_index(p, resource):
+    reached = resource >= p["Rmax"]
+    return numpy.where(reached.any(axis=1), reached.argmax(axis=1), p["Tmax"])
+
+
+"""
+batch_a_finder(d, params, lineages)
+
+:parameter d: the dictionary of parameters used in the game.
+           params: a dictionary mapping parameter names to arrays with one value per game.
+           lineages: the number of games solved together
+
+Solves many games of the same shape at once.  This is a_finder() with each step done for every
+game in a single NumPy operation, so the Python loop runs over players only, not over games.
+Ties are not reported through uniqueness_check(); as in find_dispersal_date() the earliest of
+the maximal payoffs is chosen.  NumPy's power() can round differently from math.pow() in the
+last place, so payoffs agree with the scalar functions to rounding only.
+
+:returns a_vector: a (games x Tmax) array, row g being a_finder() for game g.
+"""
+def batch_a_finder(d, params, lineages):
+    p = batch_params(d, params, lineages)
+    time = d["Tmax"]
+    a_vector = numpy.full((lineages, time), d["n"], dtype=numpy.int64)
+    days = numpy.arange(time)
+    payoffs = numpy.empty((lineages, time + 1))
+
+    for _ in range(d["n"]):
+        resource = batch_resource_vector(p, a_vector)
+        payoffs[:, :time] = batch_payoff(p, days, resource)
+        j = batch_Rmax_index(p, resource)
+        payoffs[:, time] = ((time - j) / time) * p["f"][:, 0] + p["f"][:, 0] * (p["N"][:, 0] - 1)
+        date = payoffs.argmax(axis=1)
+        a_vector -= days >= date[:, None]
+    return a_vector
+
+
+"""
+batch_departure_vector(d, a_vector)
+
+:parameter d: the dictionary of parameters used in the game.
+           a_vector: a (games x Tmax) array from batch_a_finder()
+
+The batched version of get_departure_vector().
+
+:returns departure_vector: a (games x n) array of each player's departure date.
+"""
+def batch_departure_vector(d, a_vector):
+    departure_vector = numpy.empty((a_vector.shape[0], d["n"]), dtype=numpy.int64)
+    for i in range(d["n"]):
+        departure_vector[:, i] = (a_vector > i).sum(axis=1)
+    return departure_vector
+
+
+"""
+batch_payoffs(d, params, departure_vector, a_vector)
+
+:parameter d: the dictionary of parameters used in the game.
+           params: a dictionary mapping parameter names to arrays with one value per game.
+           departure_vector: a (games x n) array from batch_departure_vector()
+           a_vector: a (games x Tmax) array from batch_a_finder()
+
+The batched version of get_payoffs().
+
+:returns payoff: a (games x n) array of each player's payoff.
+"""
+def batch_payoffs(d, params, departure_vector, a_vector):
+    p = batch_params(d, params, a_vector.shape[0])
+    resource = batch_resource_vector(p, a_vector)
+    time = d["Tmax"]
+    day = numpy.minimum(departure_vector, time - 1)
+    payoff = batch_payoff(p, day, numpy.take_along_axis(resource, day, axis=1))
+    j = batch_Rmax_index(p, resource)[:, None]
+    stay = ((time - j) / time) * p["f"] + (p["N"] - 1) * p["f"]
+    return numpy.where(departure_vector == time, stay, payoff)
+
+
 ## THE FOLLOWING FUNCTIONS ARE USED IN THE STATISTICAL ANALYSIS OR IN TESTING
 """
 get_mean(data)
@@ -391,6 +714,113 @@ def test_cases():
     else:
         print("FAIL: Payoffs: expected [56/9, 56/9], got " + str(payoffs4))
 
+    print("Grouped by date")
+    for case in [case1, case2, case3, case4]:
+        a = a_finder(case)
+        dep = get_departure_vector(case, a)
+        resource = calc_resource_vector(case, a)
+        if numpy.repeat(*get_departure_runs(case, a)).tolist() == dep:
+            print("PASS: Departure runs")
+        else:
+            print("FAIL: Departure runs: expected " + str(dep) + ", got " +
+                  str(numpy.repeat(*get_departure_runs(case, a)).tolist()))
+        if get_payoffs_by_date(case, dep, a).tolist() == get_payoffs(case, dep, a):
+            print("PASS: Payoffs by date")
+        else:
+            print("FAIL: Payoffs by date: expected " + str(get_payoffs(case, dep, a)) +
+                  ", got " + str(get_payoffs_by_date(case, dep, a).tolist()))
+        survival_rates = calc_survival_vector(case, dep, resource)
+        if calc_survival_vector_by_date(case, dep, resource).tolist() == survival_rates:
+            print("PASS: Survival by date")
+        else:
+            print("FAIL: Survival by date: expected " + str(survival_rates) + ", got " +
+                  str(calc_survival_vector_by_date(case, dep, resource).tolist()))
+
+    print("Batched cases")
+    for case in [case1, case2, case3, case4]:
+        a = batch_a_finder(case, {}, 1)
+        if a[0].tolist() == a_finder(case):
+            print("PASS: Batched a vector")
+        else:
+            print("FAIL: Batched a vector: expected " + str(a_finder(case)) + ", got " +
+                  str(a[0].tolist()))
+
+    # several lineages, each with its own k, c and N.  Payoffs are compared to rounding since
+    # NumPy's power() can differ from math.pow() in the last place.
+    batch_case = {"N": 1,
+                  "n": 10,
+                  "r": 12/5,
+                  "c": 2,
+                  "Rmin": 40,
+                  "Rmax": 80,
+                  "Tmax": 40,
+                  "b": 0.8,
+                  "k": 5,
+                  "f": 4}
+    params = {"k": numpy.array([0.5, 2, 5, 8, 3, 6]),
+              "c": numpy.array([2, 1, 3, 0.5, 4, 2]),
+              "N": numpy.array([1, 2, 1, 3, 2, 1])}
+    a = batch_a_finder(batch_case, params, 6)
+    dep = batch_departure_vector(batch_case, a)
+    payoffs = batch_payoffs(batch_case, params, dep, a)
+    for g in range(6):
+        lineage = dict(batch_case, k=params["k"][g], c=params["c"][g], N=params["N"][g])
+        a_g = a_finder(lineage)
+        dep_g = get_departure_vector(lineage, a_g)
+        if a[g].tolist() == a_g and dep[g].tolist() == dep_g and \
+                numpy.allclose(payoffs[g], get_payoffs(lineage, dep_g, a_g), rtol=1e-12):
+            print("PASS: Batched lineage " + str(g))
+        else:
+            print("FAIL: Batched lineage " + str(g) + ": expected " + str(dep_g) + ", got " +
+                  str(dep[g].tolist()))
+
+    print("Warm-started sweep")
+    sweep_case = {"N": 1,
+                  "n": 20,
+                  "r": 12/5,
+                  "c": 2,
+                  "Rmin": 40,
+                  "Rmax": 80,
+                  "Tmax": 60,
+                  "b": 0.8,
+                  "k": 5,
+                  "f": 4}
+    hint = None
+    for k in numpy.arange(5, 7.5, 0.25):
+        sweep_case["k"] = k
+        a, hint = a_finder_warm(sweep_case, hint)
+        if a == a_finder(sweep_case):
+            print("PASS: Warm a vector, k = " + str(k))
+        else:
+            print("FAIL: Warm a vector, k = " + str(k) + ": expected " +
+                  str(a_finder(sweep_case)) + ", got " + str(a))
+
+    print("Compact sweep results")
+    results = sweep(dict(sweep_case), "k", 5, 7.5, 0.25, float_dtype=numpy.float64)
+    for field in results.fields:
+        stored = getattr(results, field)[:results.count].ravel().tolist()
+        if math.isclose(results.mean(field), get_mean(stored), rel_tol=1e-12) and \
+                math.isclose(results.std(field), get_stddev(stored), rel_tol=1e-9):
+            print("PASS: Streamed mean and standard deviation of " + field)
+        else:
+            print("FAIL: Streamed mean and standard deviation of " + field + ": expected " +
+                  str((get_mean(stored), get_stddev(stored))) + ", got " +
+                  str((results.mean(field), results.std(field))))
+    q = [0, 0.1, 0.25, 0.5, 0.75, 0.9, 1]
+    expected = numpy.quantile(results.departure[:results.count], q, method="lower")
+    if (results.quantile("departure", q) == expected).all():
+        print("PASS: Departure quantiles")
+    else:
+        print("FAIL: Departure quantiles: expected " + str(expected) + ", got " +
+              str(results.quantile("departure", q)))
+    for departure in ([1] * (sweep_case["n"] - 1), [sweep_case["Tmax"] + 1] * sweep_case["n"]):
+        try:
+            SweepResults(sweep_case["n"], sweep_case["Tmax"], 1).add(
+                0, departure, [0] * len(departure), [1] * len(departure))
+            print("FAIL: Bad row accepted: " + str(departure))
+        except ValueError:
+            print("PASS: Bad row rejected")
+
 """
 calc_survival_vector(d, dep, resource)
 
@@ -412,8 +842,44 @@ def calc_survival_vector(d, departure_vector, resource):
             survival_rates.append(calc_survival(d, resource[date]))
     return survival_rates
 
+
+"""
+get_grouped_survival(d, dates, resource)
+
+:parameter d: the dictionary of parameters used in the game.
+           dates: distinct departure dates, e.g. from get_departure_runs()
+           resource: the accumulated resources of an individual at any point in time
+
+Computes the chance of survival once for each distinct departure date.
+
+:return survival_rates: an array with the chance of surviving departure on each date.
+"""
+def get_grouped_survival(d, dates, resource):
+    survival_rates = numpy.ones(len(dates))
+    for i, date in enumerate(dates):
+        if date != d["Tmax"]:
+            survival_rates[i] = calc_survival(d, resource[date])
+    return survival_rates
+
+
 """
-sensitivity_analysis(d, var, low, high, outfile, increment=1)
+calc_survival_vector_by_date(d, departure_vector, resource)
+
+:parameter d: the dictionary of parameters used in the game.
+           departure_vector: a vector of each player's departure date.
+           resource: the accumulated resources of an individual at any point in time
+
+Gives the same values as calc_survival_vector(), computing survival once per distinct departure 
+date.
+
+:return survival_rates: an array of each players chance of survival.
+"""
+def calc_survival_vector_by_date(d, departure_vector, resource):
+    dates, players = numpy.unique(departure_vector, return_inverse=True)
+    return get_grouped_survival(d, dates, resource)[players]
+
+"""
+sensitivity_analysis(d, var, low, high, outfile, increment=1, warm_start=False)
 
 :parameter d: the dictionary of parameters used in the game.
            var: the parameter we want to analyze.
@@ -421,10 +887,12 @@ sensitivity_analysis(d, var, low, high, outfile, increment=1)
            high: the maximum value of var
            outfile: the csv file we want data to be written to
            increment: the amount we increase var by in analysis, defaulted to 1
+           warm_start: if True, each point is solved with a_finder_warm() using the previous 
+           point's dispersal dates as the hint.  The results are the same either way.
            
 Completes sensitivity analysis over a single variable.
 """
-def sensitivity_analysis(d, var, low, high, outfile, increment=1):
+def sensitivity_analysis(d, var, low, high, outfile, increment=1, warm_start=False):
     with open(outfile, 'w') as file:
         file = csv.writer(file)
 
@@ -434,10 +902,14 @@ def sensitivity_analysis(d, var, low, high, outfile, increment=1):
                        "mean payoff", "standard deviation payoff",
                        "survival rates", "mean survival rate"])
 
+        hint = None
         for i in numpy.arange(low, high, increment):
             # set the parameter value then calculate the data
             d[var] = i
-            a = a_finder(d)
+            if warm_start:
+                a, hint = a_finder_warm(d, hint)
+            else:
+                a = a_finder(d)
             dep = get_departure_vector(d, a)
             p = get_payoffs(d, dep, a)
             resource = calc_resource_vector(d, a)
@@ -450,7 +922,7 @@ def sensitivity_analysis(d, var, low, high, outfile, increment=1):
 
 
 """
-individual_sensitivity_analysis(d, n, var, low, high, outfile, increment =1)
+individual_sensitivity_analysis(d, n, var, low, high, outfile, increment =1, warm_start=False)
 
 :parameter d: the dictionary of parameters used in the game.
            n: the number of players.
@@ -459,11 +931,14 @@ individual_sensitivity_analysis(d, n, var, low, high, outfile, increment =1)
            high: the maximum value of var
            outfile: the csv file we want data to be written to
            increment: the amount we increase var by in analysis, defaulted to 1
+           warm_start: if True, points are solved with a_finder_warm(), as in 
+           sensitivity_analysis
 
 Completes sensitivity analysis over a single variable for each player.  This does essentially 
 the same thing as sensitivity_analysis, but formats it by player first then variable value second.
 """
-def individual_sensitivity_analysis(d, n, var, low, high, outfile, increment =1):
+def individual_sensitivity_analysis(d, n, var, low, high, outfile, increment =1,
+                                    warm_start=False):
 
     with open(outfile, 'w') as file:
         file = csv.writer(file)
@@ -474,9 +949,13 @@ def individual_sensitivity_analysis(d, n, var, low, high, outfile, increment =1)
             for m in range(0, n):
                 newrow.append(l[m])
         file.writerow(newrow)
+        hint = None
         for i in numpy.arange(low, high, increment):
             d[var] = i
-            a = a_finder(d)
+            if warm_start:
+                a, hint = a_finder_warm(d, hint)
+            else:
+                a = a_finder(d)
             dep = get_departure_vector(d, a)
             p = get_payoffs(d, dep, a)
             resource = calc_resource_vector(d, a)
@@ -493,6 +972,219 @@ def individual_sensitivity_analysis(d, n, var, low, high, outfile, increment =1)
 
 
 
+"""
+StreamingHistogram(low=None, width=None, bins=4096, grow=True)
+
+:parameter low: the left edge of the first bin; None to take it from the first values added
+           width: the width of every bin; None to take it from the first values added
+           bins: the number of bins, which must be even if the histogram can grow
+           grow: whether the range may widen to take in values outside it
+
+A histogram with a fixed number of bins, used to give quantiles of a stream of values without 
+keeping the values.  When a value falls outside the range, adjacent pairs of bins are merged so 
+the range doubles (to the right, or to the left for values below it) until it fits.  The 
+smallest and largest values added are also kept.  Memory use is fixed, and quantiles are exact 
+to within one bin width and never outside the values added.
+"""
+class StreamingHistogram:
+    def __init__(self, low=None, width=None, bins=4096, grow=True):
+        self.low = low
+        self.width = width
+        self.grow = grow
+        self.counts = numpy.zeros(bins, dtype=numpy.int64)
+        self.smallest = math.inf
+        self.largest = -math.inf
+
+    """
+    add(self, values)
+
+    Counts values, widening the range first if needed.
+    """
+    def add(self, values):
+        values = numpy.asarray(values, dtype=float).ravel()
+        if len(values) == 0:
+            return
+        smallest, largest = values.min(), values.max()
+        self.smallest = min(self.smallest, smallest)
+        self.largest = max(self.largest, largest)
+        bins = len(self.counts)
+        if self.low is None:
+            self.low = smallest
+        if self.width is None:
+            self.width = 2 * max(largest - smallest, 1e-6 * abs(smallest), 1e-12) / bins
+
+        while self.grow and largest >= self.low + bins * self.width:
+            merged = self.counts.reshape(-1, 2).sum(axis=1)
+            self.counts[:] = 0
+            self.counts[:bins // 2] = merged
+            self.width *= 2
+        while self.grow and smallest < self.low:
+            merged = self.counts.reshape(-1, 2).sum(axis=1)
+            self.counts[:] = 0
+            self.counts[bins // 2:] = merged
+            self.low -= bins * self.width
+            self.width *= 2
+
+        index = numpy.floor((values - self.low) / self.width).astype(numpy.int64)
+        self.counts += numpy.bincount(numpy.clip(index, 0, bins - 1), minlength=bins)
+
+    """
+    quantile(self, q)
+
+    The q-th quantile(s) by the "lower" rule: the value of rank floor(q * (count - 1)) in sorted 
+    order, given as the left edge of the bin holding it, clipped to the smallest and largest 
+    values added.  q = 0 and q = 1 are therefore exact.  nan when nothing has been added.
+    """
+    def quantile(self, q):
+        cumulative = numpy.cumsum(self.counts)
+        if cumulative[-1] == 0:
+            return numpy.full(numpy.shape(q), numpy.nan)
+        rank = numpy.floor(numpy.asarray(q) * (cumulative[-1] - 1))
+        edge = self.low + numpy.searchsorted(cumulative, rank, side="right") * self.width
+        return numpy.clip(edge, self.smallest, self.largest)
+
+
+"""
+SweepResults(n, Tmax, points, float_dtype=numpy.float32, bins=4096)
+
+:parameter n: the number of players.
+           Tmax: the largest Tmax in the sweep
+           points: the number of grid points the container has room for
+           float_dtype: the dtype payoffs and survival rates are stored in
+           bins: the number of histogram bins kept for payoff and survival quantiles
+
+A compact container for sweep and batch results.  Departure dates are stored in the smallest 
+unsigned integer type that holds Tmax, and payoffs and survival rates in float_dtype, with one 
+row per grid point in arrays allocated up front.  The mean and standard deviation of each row 
+are kept in row_mean and row_std, replacing get_mean() and get_stddev() per row.  A running 
+mean and variance and a StreamingHistogram of every stored value are updated as rows are added, 
+so summary statistics never need the stored rows.  Departure dates are whole days, so their 
+histogram has one bin per day and their quantiles are exact.
+"""
+class SweepResults:
+    fields = ("departure", "payoff", "survival")
+
+    def __init__(self, n, Tmax, points, float_dtype=numpy.float32, bins=4096):
+        self.count = 0
+        self.n = n
+        self.Tmax = Tmax
+        self.values = numpy.empty(points)
+        self.departure = numpy.empty((points, n), dtype=numpy.min_scalar_type(Tmax))
+        self.payoff = numpy.empty((points, n), dtype=float_dtype)
+        self.survival = numpy.empty((points, n), dtype=float_dtype)
+        self.row_mean = {field: numpy.empty(points) for field in self.fields}
+        self.row_std = {field: numpy.empty(points) for field in self.fields}
+
+        # running totals: number of values, mean and sum of squared deviations (Welford)
+        self.totals = {field: [0, 0.0, 0.0] for field in self.fields}
+        # survival rates lie in [0, 1]; the bins are placed so that 1 is a bin's left edge
+        self.histograms = {
+            "departure": StreamingHistogram(0, 1, Tmax + 1, grow=False),
+            "payoff": StreamingHistogram(bins=bins),
+            "survival": StreamingHistogram(0, 1 / (bins - 1), bins)}
+
+    """
+    add(self, value, departure, payoff, survival)
+
+    Stores the results of one grid point, where value is the swept parameter's value.  The rows 
+    are checked before anything is stored, so a ValueError leaves the container unchanged.
+    """
+    def add(self, value, departure, payoff, survival):
+        if self.count == len(self.values):
+            raise ValueError("SweepResults is full (" + str(self.count) + " points)")
+        rows = [numpy.asarray(row, dtype=float) for row in (departure, payoff, survival)]
+        for field, row in zip(self.fields, rows):
+            if row.shape != (self.n,):
+                raise ValueError(field + " must have one entry per player (" + str(self.n) +
+                                 "), got shape " + str(row.shape))
+        if ((rows[0] < 0) | (rows[0] > self.Tmax) | (rows[0] != numpy.floor(rows[0]))).any():
+            raise ValueError("departure dates must be whole days from 0 to " + str(self.Tmax))
+
+        i = self.count
+        self.values[i] = value
+        for field, row in zip(self.fields, rows):
+            getattr(self, field)[i] = row
+            mean = row.mean()
+            squares = ((row - mean) ** 2).sum()
+            self.row_mean[field][i] = mean
+            self.row_std[field][i] = math.sqrt(squares / len(row))
+
+            # merge the row into the running totals
+            total = self.totals[field]
+            count = total[0] + len(row)
+            delta = mean - total[1]
+            total[2] += squares + delta * delta * total[0] * len(row) / count
+            total[1] += delta * len(row) / count
+            total[0] = count
+            self.histograms[field].add(row)
+        self.count += 1
+
+    """
+    mean(self, field), std(self, field)
+
+    The mean and (population) standard deviation of every stored value of "departure", "payoff" 
+    or "survival", from the running totals.  nan when the container is empty.
+    """
+    def mean(self, field):
+        count, mean, _ = self.totals[field]
+        return mean if count else math.nan
+
+    def std(self, field):
+        count, _, squares = self.totals[field]
+        return math.sqrt(squares / count) if count else math.nan
+
+    """
+    quantile(self, field, q)
+
+    The q-th quantile(s) of every stored value of field, from its StreamingHistogram by the 
+    "lower" rule (see StreamingHistogram.quantile()).  Departure quantiles are exact, and 
+    payoff and survival quantiles are exact to within one bin width and lie between the 
+    smallest and largest stored values.
+    """
+    def quantile(self, field, q):
+        return self.histograms[field].quantile(q)
+
+
+"""
+sweep(d, var, low, high, increment=1, float_dtype=numpy.float32, warm_start=False)
+
+:parameter d: the dictionary of parameters used in the game.
+           var: the parameter we want to analyze.
+           low: the minimum value of var
+           high: the maximum value of var
+           increment: the amount we increase var by in analysis, defaulted to 1
+           float_dtype: the dtype payoffs and survival rates are stored in
+           warm_start: if True, points are solved with a_finder_warm(), as in 
+           sensitivity_analysis
+
+Computes the same data as sensitivity_analysis, but keeps it in a SweepResults rather than 
+writing it out.  Payoffs and survival rates are computed once per distinct departure date.  The 
+number of players fixes the shape of the results, so "n" cannot be swept.
+
+:return results: a SweepResults holding every grid point.
+"""
+def sweep(d, var, low, high, increment=1, float_dtype=numpy.float32, warm_start=False):
+    if var == "n":
+        raise ValueError("'n' cannot be swept into a SweepResults")
+    grid = numpy.arange(low, high, increment)
+    Tmax = int(max(grid.max(), d["Tmax"])) if var == "Tmax" and len(grid) else d["Tmax"]
+    results = SweepResults(d["n"], Tmax, len(grid), float_dtype)
+
+    hint = None
+    for i in grid:
+        d[var] = i
+        if warm_start:
+            a, hint = a_finder_warm(d, hint)
+        else:
+            a = a_finder(d)
+        dates, counts = get_departure_runs(d, a)
+        resource = calc_resource_vector(d, a)
+        results.add(i, numpy.repeat(dates, counts),
+                    numpy.repeat(get_grouped_payoffs(d, dates, a), counts),
+                    numpy.repeat(get_grouped_survival(d, dates, resource), counts))
+    return results
+
+
 def main():
     """
     declare dictionary here:
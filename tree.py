@@ -1,17 +1,27 @@
 #Author: Thomas Narramore, Western Colorado class fo 2025.
 import math
+import os
+import tempfile
+import numpy
 from fastnash import *
 import treelib as tl
 
+# integer code written in place of 'n' (still in the natal area) in exported states arrays
+NO_DISPERSAL = -1
+
 # nodeData holds the player, day, and states and efrs vector for decision nodes
+# dispersed records whether the move into this node was a dispersal, and choice is the identifier
+# of the child solveNE picked
 # modifies underlying treelib class
 class nodeData(tl.Node):
-    def __init__(self, states, efrs, day, p):
+    def __init__(self, states, efrs, day, p, dispersed=False):
         self.states = states 
         self.efrs = efrs
         self.day = day
         self.p = p
         self.solved = False
+        self.dispersed = dispersed
+        self.choice = None
 
 def solveNE(tree, root):
     children = tree.children(root.identifier)
@@ -20,23 +30,63 @@ def solveNE(tree, root):
             solveNE(tree, child)
     player = root.data.p
     if children[0].data.efrs[player] > children[1].data.efrs[player]:
-        efrs = children[0].data.efrs
-        states = children[0].data.states
+        chosen = children[0]
     else:
-        efrs = children[1].data.efrs
-        states = children[1].data.states
+        chosen = children[1]
+    efrs = chosen.data.efrs
+    states = chosen.data.states
+    root.data.choice = chosen.identifier
     root.data.efrs = efrs
     root.data.states = states
     return (states, efrs)
 
+# equilibrium_path - follow the choices solveNE made from root down to a leaf; call after solveNE
+# returns arrays of the deciding player, the day and whether the player dispersed at each step
+def equilibrium_path(tree, root):
+    players, days, dispersed = [], [], []
+    node = root
+    while node.data.choice is not None:
+        child = tree[node.data.choice]
+        players.append(node.data.p)
+        days.append(node.data.day)
+        dispersed.append(child.data.dispersed)
+        node = child
+    return (numpy.array(players, dtype=numpy.int16), numpy.array(days, dtype=numpy.int16),
+            numpy.array(dispersed, dtype=numpy.int8))
+
+# export_equilibrium - write the solveNE equilibrium path and its states and efrs to a .npz file
+# read back with numpy.load(outfile)
+def export_equilibrium(tree, root, outfile):
+    states, efrs = solveNE(tree, root)
+    players, days, dispersed = equilibrium_path(tree, root)
+    numpy.savez(outfile, player=players, day=days, dispersed=dispersed,
+                states=encode_states(states), efrs=numpy.array(efrs, dtype=float))
+
+# encode_states - states vector as integers, with NO_DISPERSAL in place of 'n'
+def encode_states(states):
+    return numpy.array([NO_DISPERSAL if s == 'n' else s for s in states], dtype=numpy.int16)
+
+# open_leaf_file - create a memory-mapped .npy file with room for count leaves of an n player game
+# each record holds a leaf's encoded states and its efrs; read back with numpy.load(outfile, mmap_mode='r')
+def open_leaf_file(outfile, n, count):
+    dtype = numpy.dtype([('states', numpy.int16, (n,)), ('efrs', numpy.float64, (n,))])
+    return numpy.lib.format.open_memmap(outfile, mode='w+', dtype=dtype, shape=(count,))
+
+# export_leaves - write the states and efrs of every leaf of a solved tree to a memory-mapped file
+def export_leaves(tree, outfile):
+    leaves = tree.leaves()
+    out = open_leaf_file(outfile, len(tree['root'].data.states), len(leaves))
+    for i, leaf in enumerate(leaves):
+        out['states'][i] = encode_states(leaf.data.states)
+        out['efrs'][i] = leaf.data.efrs
+    out.flush()
+    return out
+
 def get_leaf_info(tree):
-    leaves = []
-    for node in tree.nodes:
-        if tree.children(node) == []:
-            leaves.append(node)
+    leaves = tree.leaves()
     leafData = [(0, 0)] * len(leaves)
     for i, leaf in enumerate(leaves):
-        leafData[i] = (tree[leaf].data.states, tree[leaf].data.efrs)
+        leafData[i] = (leaf.data.states, leaf.data.efrs)
     return leafData
 
 
@@ -181,7 +231,7 @@ def recursive_build_tree(tree, root, d):
     child2 = "d" + str(day) + "p" + str(p) + str(states)
     tree.create_node(tag = child2, identifier = child2,
                      parent = root.identifier,
-                     data = nodeData(states.copy(), efrs.copy(), day, p))
+                     data = nodeData(states.copy(), efrs.copy(), day, p, dispersed=True))
 
     # if Tmax was reached at the parent node, and all players have gone, update non-disperser efrs and break.
     if root.data.day >= d['Tmax'] and root.data.p >= p:
@@ -210,7 +260,8 @@ def find_max_sum(tree):
     return max
 
 # Solve function takes input of a dictionary of parameters and returns a tuple containing the timing and payoff vectors
-def solve(d):
+# if outfile is given, each leaf's states and efrs are also written to it as they are computed (see open_leaf_file)
+def solve(d, outfile=None):
 
     # compute Rmax and update
     d['Rmax'] = d['Rmin'] + (d['Tmax'] + 1)*d['r']/d['n']
@@ -238,13 +289,63 @@ def solve(d):
 
     d['Tmax'] += 1
 
-    for leaf in tree.leaves():
+    leaves = tree.leaves()
+    if outfile is not None:
+        out = open_leaf_file(outfile, d['n'], len(leaves))
+    for i, leaf in enumerate(leaves):
         leaf.data.efrs = get_payoffs(d, leaf.data.states, calc_a(d, leaf.data.states))
+        if outfile is not None:
+            out['states'][i] = encode_states(leaf.data.states)
+            out['efrs'][i] = leaf.data.efrs
+    if outfile is not None:
+        out.flush()
 
     d['Tmax'] -= 1
     return tree
 
 
+# test_export - checks the leaf file written by solve against get_leaf_info, and that replaying
+# the saved equilibrium path from all-'n' states gives the states solveNE returns
+def test_export():
+    d = {"N": 2,
+         "n": 3,
+         "r": 12 / 5,
+         "c": 2,
+         "Rmin": 40,
+         "Rmax": 40 + 136,
+         "Tmax": 2,
+         "b": 4,
+         "k": .8,
+         "f": 3}
+    folder = tempfile.mkdtemp()
+    leafFile = os.path.join(folder, 'leaves.npy')
+    pathFile = os.path.join(folder, 'equilibrium.npz')
+    try:
+        tree = solve(d, leafFile)
+        leaves = numpy.load(leafFile, mmap_mode='r')
+        leafData = get_leaf_info(tree)
+        match = len(leaves) == len(leafData) and all(
+            (leaves['states'][i] == encode_states(states)).all() and
+            (leaves['efrs'][i] == efrs).all() for i, (states, efrs) in enumerate(leafData))
+        print(("PASS" if match else "FAIL") + ": leaf file matches get_leaf_info")
+        del leaves
+
+        export_equilibrium(tree, tree['root'], pathFile)
+        with numpy.load(pathFile) as path:
+            states = ['n'] * d['n']
+            for player, day, dispersed in zip(path['player'], path['day'], path['dispersed']):
+                if dispersed:
+                    states[player] = int(day)
+            expected = tree['root'].data.states
+            match = states == expected and (path['states'] == encode_states(expected)).all()
+        print(("PASS" if match else "FAIL") + ": replayed path " + str(states) +
+              ", solveNE " + str(expected))
+    finally:
+        for name in (leafFile, pathFile):
+            if os.path.exists(name):
+                os.remove(name)
+        os.rmdir(folder)
+
 
 def main():
     baseD = {"N": 2,